@@ -6,12 +6,18 @@ Run with: streamlit run app.py
 Or with Docker: docker-compose up analytics
 """
 
+import hmac
 import os
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 import bcrypt
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
@@ -23,51 +29,74 @@ def load_credentials() -> dict:
     Load credentials from .env file.
     Expected format: username:pass_hash (one per line)
     Note: bcrypt hashes contain $ characters, so we split only on the first colon.
-    
+
+    The parsed result is cached and only re-read when the environment variable
+    or the .env file modification time changes.
+
     Returns:
         Dictionary mapping username to password hash
     """
-    credentials = {}
-    
     # Try to find .env file in project root
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     env_file = project_root / ".env"
-    
+
     # Also check if ANALYTICS_CREDENTIALS or TIMETAGGER_CREDENTIALS env var is set
     env_creds = os.getenv("ANALYTICS_CREDENTIALS") or os.getenv("TIMETAGGER_CREDENTIALS")
-    
+
+    env_file_mtime = None
+    if not env_creds:
+        try:
+            env_file_mtime = env_file.stat().st_mtime_ns
+        except OSError:
+            pass
+
+    return _parse_credentials(env_creds, str(env_file), env_file_mtime)
+
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def _parse_credentials(
+    env_creds: Optional[str], env_file: str, env_file_mtime: Optional[int]
+) -> dict:
+    """
+    Parse credentials from the environment variable value or the .env file.
+
+    Args:
+        env_creds: Value of the credentials environment variable (takes precedence)
+        env_file: Path to the .env file
+        env_file_mtime: Modification time of the .env file, used as cache key
+
+    Returns:
+        Dictionary mapping username to password hash
+    """
     if env_creds:
         # Parse credentials from environment variable
         # Format: username1:hash1,username2:hash2 or username:hash
-        for cred_line in env_creds.split(","):
-            cred_line = cred_line.strip()
-            if ":" in cred_line:
-                # Split only on first colon to preserve hash with $ characters
-                parts = cred_line.split(":", 1)
-                if len(parts) == 2:
-                    username = parts[0].strip()
-                    pass_hash = parts[1].strip()
-                    if username and pass_hash:
-                        credentials[username] = pass_hash
-    elif env_file.exists():
-        # Read from .env file
+        return _parse_credential_lines(env_creds.split(","))
+    elif env_file_mtime is not None:
+        # Read from .env file, one line at a time
         with open(env_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and comments
-                if not line or line.startswith("#"):
-                    continue
-                # Split only on first colon to preserve hash with $ characters
-                if ":" in line:
-                    parts = line.split(":", 1)
-                    if len(parts) == 2:
-                        username = parts[0].strip()
-                        pass_hash = parts[1].strip()
-                        # Don't strip the hash further - preserve all $ characters
-                        if username and pass_hash:
-                            credentials[username] = pass_hash
-    
+            return _parse_credential_lines(f)
+    return {}
+
+
+def _parse_credential_lines(lines: Iterable[str]) -> dict:
+    """Parse username:pass_hash lines, skipping empty lines and comments."""
+    credentials = {}
+
+    for line in lines:
+        line = line.strip()
+        # Skip empty lines and comments
+        if not line or line.startswith("#"):
+            continue
+        # Split only on first colon to preserve hash with $ characters
+        username, sep, pass_hash = line.partition(":")
+        username = username.strip()
+        # Don't strip the hash further - preserve all $ characters
+        pass_hash = pass_hash.strip()
+        if sep and username and pass_hash:
+            credentials[username] = pass_hash
+
     return credentials
 
 
@@ -102,29 +131,119 @@ def verify_password(password: str, password_hash: str) -> bool:
         return False
 
 
+# Failed logins allowed per username and session within LOGIN_WINDOW_SECONDS
+MAX_LOGIN_ATTEMPTS = 5
+LOGIN_WINDOW_SECONDS = 60
+
+
+@st.cache_resource(show_spinner=False)
+def _get_bcrypt_executor() -> ThreadPoolExecutor:
+    """Thread pool bounding how many bcrypt verifications run at once."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="bcrypt")
+
+
+def _get_login_failures() -> dict:
+    """Recent failed login times per username, kept in this session's state."""
+    return st.session_state.setdefault("login_failures", {})
+
+
+def is_login_rate_limited(username: str) -> bool:
+    """
+    Check whether this session failed to log in as a username too often recently.
+
+    Only failed attempts are counted, and per session, so failures from other
+    clients can never lock the owner out. A new session starts with a clean slate;
+    the limit keeps a single session from monopolizing bcrypt, it is not a lockout.
+
+    Args:
+        username: Username being logged in to
+
+    Returns:
+        True if the attempt must be rejected without checking the password
+    """
+    failures = _get_login_failures()
+    now = time.monotonic()
+    recent = [t for t in failures.get(username, []) if now - t < LOGIN_WINDOW_SECONDS]
+    failures[username] = recent
+    return len(recent) >= MAX_LOGIN_ATTEMPTS
+
+
+def record_login_failure(username: str):
+    """Remember a failed login attempt of this session."""
+    _get_login_failures().setdefault(username, []).append(time.monotonic())
+
+
+def reset_login_attempts(username: str):
+    """Forget the failed login attempts of a username after a successful login."""
+    _get_login_failures().pop(username, None)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_dummy_hash(rounds: int) -> str:
+    """Bcrypt hash of a random password, used when the username is unknown."""
+    return bcrypt.hashpw(secrets.token_bytes(16), bcrypt.gensalt(rounds)).decode(
+        "utf-8"
+    )
+
+
+def _bcrypt_rounds(password_hash: str) -> int:
+    """Extract the cost factor from a bcrypt hash ($2b$12$...), defaulting to 12."""
+    try:
+        rounds = int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return 12
+    return rounds if 4 <= rounds <= 31 else 12
+
+
+def _get_credentials_dummy_hash(credentials: dict) -> str:
+    """Dummy hash with the cost factor of the configured credentials."""
+    sample_hash = next(iter(credentials.values()), "")
+    return _get_dummy_hash(_bcrypt_rounds(sample_hash))
+
+
 def check_authentication(username: str, password: str) -> bool:
     """
     Check if username and password are valid.
-    
+
+    A bcrypt verification is always performed (against a dummy hash of the
+    same cost for unknown users), so the response time does not reveal
+    whether a username exists.
+
     Args:
         username: Username to check
         password: Password to check
-        
+
     Returns:
         True if credentials are valid, False otherwise
     """
     credentials = load_credentials()
-    
-    if username not in credentials:
-        return False
-    
-    stored_hash = credentials[username]
-    return verify_password(password, stored_hash)
+
+    username_bytes = username.encode("utf-8")
+    stored_hash = None
+    for known_username, known_hash in credentials.items():
+        if hmac.compare_digest(known_username.encode("utf-8"), username_bytes):
+            stored_hash = known_hash
+
+    user_exists = stored_hash is not None
+    if not user_exists:
+        stored_hash = _get_credentials_dummy_hash(credentials)
+
+    # bcrypt releases the GIL; the pool caps concurrent verifications
+    password_ok = (
+        _get_bcrypt_executor().submit(verify_password, password, stored_hash).result()
+    )
+
+    # Non-short-circuiting "and" so both checks always run
+    return password_ok & user_exists
 
 
 def show_login_page():
     """Display login page."""
     st.title("🔐 Login to Timetagger Analytics")
+
+    # Compute the dummy hash before any login attempt, so the first unknown-user
+    # check does not pay for hashpw and reveal itself by a slower response
+    _get_credentials_dummy_hash(load_credentials())
     
     with st.form("login_form"):
         username = st.text_input("Username", key="login_username")
@@ -134,14 +253,31 @@ def show_login_page():
         if submit_button:
             if not username or not password:
                 st.error("Please enter both username and password.")
+            elif is_login_rate_limited(username):
+                st.error("Too many login attempts. Please try again in a minute.")
             elif check_authentication(username, password):
+                reset_login_attempts(username)
                 st.session_state["authenticated"] = True
                 st.session_state["username"] = username
                 st.rerun()
             else:
+                record_login_failure(username)
                 st.error("Invalid username or password.")
 
 
+# Deepest tag level offered by the sunburst chart
+MAX_TAG_DEPTH = 5
+
+# Granularity options of the stacked bar chart
+GRANULARITIES = ["days", "weeks", "months"]
+
+# Display label format of a period, by granularity
+PERIOD_LABEL_FORMATS = {"days": "%b %d, %Y", "weeks": "Week %W, %Y", "months": "%B %Y"}
+
+# date(1970, 1, 1).toordinal(), to turn datetime64 day counts into ordinals
+EPOCH_ORDINAL = 719163
+
+
 def get_date_range_from_granularity(
     granularity: str, base_date: datetime
 ) -> Tuple[datetime, datetime]:
@@ -170,233 +306,248 @@ def get_date_range_from_granularity(
     return start, end
 
 
-def get_period_key(date: datetime, granularity: str) -> str:
-    """Get a string key representing the time period for a given date."""
+def get_period_key(date: datetime, granularity: str) -> int:
+    """
+    Get an integer key representing the time period for a given date.
+
+    Keys are the day ordinal for days, the ordinal of the Monday for weeks and
+    year * 12 + month - 1 for months. Use format_period_keys for display.
+    """
     if granularity == "days":
-        return date.strftime("%Y-%m-%d")
+        return date.toordinal()
     elif granularity == "weeks":
-        # Get Monday of the week
-        days_since_monday = date.weekday()
-        monday = date - timedelta(days=days_since_monday)
-        return monday.strftime("%Y-W%W")
+        # Ordinal of the Monday of the week
+        return date.toordinal() - date.weekday()
     elif granularity == "months":
-        return date.strftime("%Y-%m")
+        return date.year * 12 + date.month - 1
     else:
-        return date.strftime("%Y-%m-%d")
+        return date.toordinal()
 
 
+@lru_cache(maxsize=4096)
 def get_period_start_end(
-    period_key: str, granularity: str
+    period_key: int, granularity: str
 ) -> Tuple[datetime, datetime]:
     """Get the start and end datetime for a given period key."""
     if granularity == "days":
-        period_date = datetime.strptime(period_key, "%Y-%m-%d")
-        start = period_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        start = datetime.fromordinal(period_key)
         end = start + timedelta(days=1)
     elif granularity == "weeks":
-        # Parse week format: YYYY-WWW
-        year, week = period_key.split("-W")
-        year = int(year)
-        week = int(week)
-        # Get first Monday of the year
-        jan1 = datetime(year, 1, 1)
-        days_offset = (7 - jan1.weekday()) % 7  # Days to first Monday
-        first_monday = jan1 + timedelta(days=days_offset)
-        # Calculate the Monday of the target week
-        start = first_monday + timedelta(weeks=week - 1)
-        start = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        start = datetime.fromordinal(period_key)
         end = start + timedelta(weeks=1)
     elif granularity == "months":
-        period_date = datetime.strptime(period_key, "%Y-%m")
-        start = period_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        if start.month == 12:
-            end = start.replace(year=start.year + 1, month=1)
-        else:
-            end = start.replace(month=start.month + 1)
+        year, month = divmod(period_key, 12)
+        start = datetime(year, month + 1, 1)
+        year, month = divmod(period_key + 1, 12)
+        end = datetime(year, month + 1, 1)
     else:
-        period_date = datetime.strptime(period_key, "%Y-%m-%d")
-        start = period_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        start = datetime.fromordinal(period_key)
         end = start + timedelta(days=1)
 
     return start, end
 
 
-def split_record_across_periods(
-    record: dict, granularity: str
-) -> List[Tuple[str, float]]:
+def get_period_boundaries(
+    start_dt: datetime, end_dt: datetime, granularity: str
+) -> Tuple[List[int], List[datetime]]:
     """
-    Split a record across multiple periods if it spans them.
+    Get the periods covering [start_dt, end_dt).
 
     Returns:
-        List of tuples: [(period_key, duration_in_seconds)]
+        (period_keys, boundaries) where period i spans
+        boundaries[i] to boundaries[i + 1]
     """
-    start_dt = record.get("datetime_start")
-    end_dt = record.get("datetime_end")
+    period_keys = []
+    period_start, period_end = get_period_start_end(
+        get_period_key(start_dt, granularity), granularity
+    )
+    boundaries = [period_start]
+
+    while True:
+        period_keys.append(get_period_key(period_start, granularity))
+        boundaries.append(period_end)
+        if period_end >= end_dt:
+            break
+        period_start, period_end = get_period_start_end(
+            get_period_key(period_end, granularity), granularity
+        )
 
-    if not start_dt or not end_dt:
-        # Fallback to single period
-        period_key = get_period_key(start_dt or datetime.now(), granularity)
-        return [(period_key, record.get("duration", 0))]
+    return period_keys, boundaries
 
-    result = []
-    current_start = start_dt
 
-    while current_start < end_dt:
-        # Get period for current start time
-        current_period_key = get_period_key(current_start, granularity)
-        period_start, period_end = get_period_start_end(current_period_key, granularity)
+def format_period_keys(period_keys: pd.Index, granularity: str) -> List[str]:
+    """Get the display labels for an index of period keys."""
+    keys = np.asarray(period_keys, dtype="int64")
+    if granularity == "months":
+        # datetime64[M] counts months since 1970-01
+        starts = (keys - 1970 * 12).astype("datetime64[M]")
+    else:
+        starts = (keys - EPOCH_ORDINAL).astype("datetime64[D]")
 
-        # Calculate overlap
-        overlap_start = max(current_start, period_start)
-        overlap_end = min(end_dt, period_end)
+    label_format = PERIOD_LABEL_FORMATS.get(granularity, "%Y-%m-%d")
+    return pd.DatetimeIndex(starts).strftime(label_format).tolist()
 
-        if overlap_start < overlap_end:
-            duration = (overlap_end - overlap_start).total_seconds()
-            result.append((current_period_key, duration))
 
-        # Move to next period
-        current_start = period_end
+def split_intervals_across_periods(
+    starts: np.ndarray, ends: np.ndarray, boundaries: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split many intervals [start, end) across the periods they span.
 
-    return result
+    Args:
+        starts: Interval starts (int64 timestamps)
+        ends: Interval ends, same unit as starts
+        boundaries: Sorted period boundaries covering all intervals, same unit;
+            period i spans boundaries[i] to boundaries[i + 1]
 
+    Returns:
+        (interval_index, period_index, overlap) arrays with one entry per
+        (interval, period) overlap; overlap is in the unit of the inputs
+    """
+    # Index of the first and one past the last period each interval touches
+    first = np.searchsorted(boundaries, starts, side="right") - 1
+    last = np.searchsorted(boundaries, ends, side="left")
+    counts = last - first
+
+    # Intervals within a single period (the common case) are not split
+    single = np.flatnonzero(counts == 1)
+    crossing = np.flatnonzero(counts > 1)
+    counts = counts[crossing]
+
+    # One row per (interval, period) pair of the boundary-crossing intervals
+    interval_index = np.repeat(crossing, counts)
+    run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+    period_index = first[interval_index] + np.arange(len(interval_index)) - run_starts
+
+    overlap_start = np.maximum(starts[interval_index], boundaries[period_index])
+    overlap_end = np.minimum(ends[interval_index], boundaries[period_index + 1])
+
+    return (
+        np.concatenate([single, interval_index]),
+        np.concatenate([first[single], period_index]),
+        np.concatenate([ends[single] - starts[single], overlap_end - overlap_start]),
+    )
 
-def group_by_period_and_tags(records: List[dict], granularity: str) -> dict:
+
+def group_by_period_and_tags(df: pd.DataFrame, granularity: str) -> pd.DataFrame:
     """
     Group records by time period and level 1 tags.
     Splits records that span multiple periods.
 
+    All records are split in one vectorized pass over precomputed period
+    boundaries (see split_intervals_across_periods); records within a single
+    period skip the split.
+
     Returns:
-        Dictionary: {period_key: {tag: total_duration}}
+        DataFrame indexed by integer period key (see get_period_key) with one
+        column of total duration (seconds) per tag, both axes sorted
     """
-    grouped = {}
-
-    for record in records:
-        if not record.get("datetime_start") or not record.get("datetime_end"):
-            # Skip records without proper timestamps
-            continue
-
-        # Get level 1 tag (first tag or "No tags")
-        tags = record.get("tags", [])
-        tag = tags[0] if tags else "No tags"
-
-        # Split record across periods
-        period_splits = split_record_across_periods(record, granularity)
-
-        for period_key, duration in period_splits:
-            # Initialize if needed
-            if period_key not in grouped:
-                grouped[period_key] = {}
-            if tag not in grouped[period_key]:
-                grouped[period_key][tag] = 0
+    if df.empty:
+        return pd.DataFrame()
+
+    # Skip records without proper timestamps (or without any duration)
+    records = df.dropna(subset=["datetime_start", "datetime_end"])
+    records = records[records["datetime_end"] > records["datetime_start"]]
+    if records.empty:
+        return pd.DataFrame()
+
+    # Level 1 tag (first tag or "No tags")
+    tag_codes, all_tags = pd.factorize(get_tag_levels(records, 1)["tag_1"], sort=True)
+
+    # Work on integer microseconds
+    starts = records["datetime_start"].to_numpy("datetime64[us]").astype("int64")
+    ends = records["datetime_end"].to_numpy("datetime64[us]").astype("int64")
+    period_keys, boundaries = get_period_boundaries(
+        records["datetime_start"].min(), records["datetime_end"].max(), granularity
+    )
+    boundaries = np.array(boundaries, dtype="datetime64[us]").astype("int64")
 
-            # Add duration for this period
-            grouped[period_key][tag] += duration
+    record_index, period_index, overlap = split_intervals_across_periods(
+        starts, ends, boundaries
+    )
 
-    return grouped
+    # Sum durations on a single flat (period, tag) key
+    flat_keys = period_index * len(all_tags) + tag_codes[record_index]
+    totals = np.bincount(
+        flat_keys, weights=overlap / 1e6, minlength=len(period_keys) * len(all_tags)
+    ).reshape(len(period_keys), len(all_tags))
+
+    # Only keep periods that have any records
+    has_records = np.bincount(period_index, minlength=len(period_keys)) > 0
+    return pd.DataFrame(
+        totals[has_records],
+        index=np.asarray(period_keys)[has_records],
+        columns=list(all_tags),
+    )
 
 
-def group_by_tags_hierarchy(records: list[dict], max_depth: int) -> dict:
+def get_tag_levels(df: pd.DataFrame, max_depth: int) -> pd.DataFrame:
     """
-    Group records by tag hierarchy.
-    Returns nested dictionary structure: {tag1: {tag2: {tag3: duration}}}
+    Get one categorical column per tag depth: tag_1 ... tag_<max_depth>.
+
+    Columns precomputed by add_tag_levels are reused, so the tag lists of a
+    DataFrame are only exploded once for all groupings.
 
     Args:
-        records: List of parsed records
-        max_depth: Maximum depth of tag hierarchy to consider
+        df: DataFrame of parsed records
+        max_depth: Number of tag levels
 
     Returns:
-        Nested dictionary with tag hierarchy and total durations
+        DataFrame with the same index as df; records without tags have
+        "No tags" as tag_1, levels below a record's last tag are None
     """
-    hierarchy = {}
-
-    for record in records:
-        tags = record["tags"][:max_depth]  # Limit to max_depth
-        duration = record["duration"]
-
-        if not tags:
-            # Records without tags go to "No tags"
-            if "No tags" not in hierarchy:
-                hierarchy["No tags"] = {}
-            hierarchy["No tags"]["_total"] = (
-                hierarchy["No tags"].get("_total", 0) + duration
-            )
-            continue
+    tag_columns = [f"tag_{depth + 1}" for depth in range(max_depth)]
+    if all(column in df.columns for column in tag_columns):
+        return df[tag_columns]
 
-        # Build nested structure
-        current = hierarchy
-        for i, tag in enumerate(tags):
-            if tag not in current:
-                current[tag] = {}
-            if i == len(tags) - 1:
-                # Last tag, add duration
-                current[tag]["_total"] = current[tag].get("_total", 0) + duration
-            else:
-                # Intermediate tag, continue nesting
-                if "_total" not in current[tag]:
-                    current[tag]["_total"] = 0
-            current = current[tag]
+    # One column per depth, padded with None; limit to max_depth
+    tags = pd.DataFrame(df["tags"].str[:max_depth].tolist(), index=df.index)
+    tags = tags.reindex(columns=range(max_depth))
+    tags.columns = tag_columns
+    # Records without tags go to "No tags"
+    tags["tag_1"] = tags["tag_1"].fillna("No tags")
+    # Categorical columns group on integer codes instead of hashing strings
+    return tags.astype("category")
 
-    return hierarchy
 
+def add_tag_levels(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the tag level columns of get_tag_levels up to MAX_TAG_DEPTH to df."""
+    return df.join(get_tag_levels(df, MAX_TAG_DEPTH))
 
-def flatten_hierarchy(
-    hierarchy: dict, prefix: str = "", max_depth: int = None, current_depth: int = 0
-) -> dict:
+
+def group_by_tags_hierarchy(df: pd.DataFrame, max_depth: int) -> pd.Series:
     """
-    Flatten nested hierarchy for pie chart display.
+    Group records by tag hierarchy.
+    Returns total durations per tag path: {(tag1, tag2, tag3): duration}
 
     Args:
-        hierarchy: Nested dictionary structure
-        prefix: Prefix for current level
-        max_depth: Maximum depth to flatten (None for all)
-        current_depth: Current depth in recursion
+        df: DataFrame of parsed records
+        max_depth: Maximum depth of tag hierarchy to consider
 
     Returns:
-        Dictionary with keys as tag paths and values as durations
+        Series of total durations indexed by tag path, one MultiIndex level
+        per depth (None below the last tag of a record)
     """
-    result = {}
-
-    if max_depth is not None and current_depth >= max_depth:
-        # Reached max depth, sum all nested values
-        total = sum(
-            v
-            if isinstance(v, (int, float))
-            else flatten_hierarchy(v, prefix, None, current_depth + 1).get("_total", 0)
-            for v in hierarchy.values()
-            if v != "_total"
-        )
-        if total > 0:
-            result[prefix or "All"] = total
-        return result
-
-    for key, value in hierarchy.items():
-        if key == "_total":
-            continue
-
-        new_prefix = f"{prefix} > {key}" if prefix else key
-
-        if isinstance(value, dict):
-            if "_total" in value and len(value) == 1:
-                # Leaf node with only _total
-                result[new_prefix] = value["_total"]
-            else:
-                # Has children, recurse
-                nested = flatten_hierarchy(
-                    value, new_prefix, max_depth, current_depth + 1
-                )
-                result.update(nested)
-        else:
-            result[new_prefix] = value
+    if df.empty:
+        return pd.Series(dtype=float)
 
-    return result
+    tags = get_tag_levels(df, max_depth)
+    return (
+        tags.assign(duration=df["duration"].astype("float64"))
+        .groupby(list(tags.columns), dropna=False, observed=True)["duration"]
+        .sum()
+    )
 
 
 def create_sunburst_data(
-    hierarchy: dict, max_depth: int
+    hierarchy: pd.Series, max_depth: int
 ) -> Tuple[List[str], List[str], List[str], List[float]]:
     """
     Create data for sunburst chart from hierarchy.
 
+    Node values are the total duration of all records under the node's tag
+    path, so they can be used with branchvalues="total" directly.
+
     Returns:
         (ids, labels, parents, values)
     """
@@ -405,88 +556,198 @@ def create_sunburst_data(
     parents = []
     values = []
 
-    def calculate_node_value(node: dict) -> float:
-        """Calculate the total value for a node (sum of all children or direct value)."""
-        # Check if this is a leaf node (only has _total)
-        children_keys = [k for k in node.keys() if k != "_total"]
-        if not children_keys:
-            # Leaf node - return its direct value
-            return node.get("_total", 0)
-
-        # Intermediate node - sum all children
-        total = 0
-        for key in children_keys:
-            value = node[key]
-            if isinstance(value, dict):
-                total += calculate_node_value(value)
-            else:
-                total += value
-
-        return total
-
-    def traverse(node: dict, parent_id: str = "", depth: int = 0):
-        if depth > max_depth:
-            return
-
-        for tag, data in node.items():
-            if tag == "_total":
+    if hierarchy.empty:
+        return ids, labels, parents, values
+
+    depth_count = min(hierarchy.index.nlevels, max_depth)
+
+    # Roll totals up bottom-up: each depth is summed from the (already
+    # aggregated) depth below it, so every record is summed only once
+    level_totals = hierarchy
+    nodes_by_depth = []
+    for depth in reversed(range(depth_count)):
+        if depth < hierarchy.index.nlevels - 1:
+            level_totals = level_totals.groupby(
+                level=list(range(depth + 1)), dropna=False, observed=True
+            ).sum()
+        # Nodes at this depth: every tag path of length depth + 1
+        is_node = level_totals.index.get_level_values(depth).notna()
+        nodes_by_depth.append(level_totals[is_node])
+
+    for node_values in reversed(nodes_by_depth):
+        for path, node_value in node_values.items():
+            if node_value <= 0:
                 continue
+            if not isinstance(path, tuple):
+                path = (path,)
+            ids.append(" > ".join(path))
+            labels.append(path[-1])
+            parents.append(" > ".join(path[:-1]))
+            values.append(node_value)
 
-            # Create unique ID for this node
-            if parent_id:
-                current_id = f"{parent_id} > {tag}"
-            else:
-                current_id = tag
+    return ids, labels, parents, values
 
-            if isinstance(data, dict):
-                # Check if this node has children (besides _total)
-                has_children = any(k != "_total" for k in data.keys())
 
-                # Calculate the value for this node
-                node_value = calculate_node_value(data)
+@st.cache_resource
+def get_db() -> TimetaggerDB:
+    """Get a database connection shared across reruns and sessions."""
+    # The analytics app never writes; the data volume is mounted read-only
+    db = TimetaggerDB(read_only=True)
+    db.connect()
+    return db
 
-                if node_value > 0:
-                    ids.append(current_id)
-                    labels.append(tag)
-                    parents.append(parent_id if parent_id else "")
-                    values.append(node_value)
 
-                # Recurse for children
-                if has_children and depth < max_depth:
-                    traverse(data, current_id, depth + 1)
-            else:
-                # Leaf value
-                if data > 0:
-                    ids.append(current_id)
-                    labels.append(tag)
-                    parents.append(parent_id if parent_id else "")
-                    values.append(data)
-
-    traverse(hierarchy, "", 0)
-    return ids, labels, parents, values
+@st.cache_data(ttl=300)
+def load_date_bounds() -> Optional[Tuple[datetime, datetime]]:
+    """Load and cache the (min start, max end) dates of all records."""
+    return get_db().get_date_bounds()
 
 
 @st.cache_data
 def load_data(start_date: datetime, end_date: datetime) -> pd.DataFrame:
     """Load and cache data from database."""
-    with TimetaggerDB() as db:
-        records = db.get_parsed_records(start_date, end_date)
-    return pd.DataFrame(records)
+    # Column-oriented result: no per-record dicts on the way into pandas
+    df = pd.DataFrame(get_db().get_parsed_columns(start_date, end_date))
+    if not df.empty:
+        # A single duration in whole seconds is exact in float32 (halves the bytes
+        # kept per record), but sums are not: aggregate in float64
+        df["duration"] = df["duration"].astype("float32")
+        # Shared by the sunburst and bar chart groupings
+        df = add_tag_levels(df)
+    return df
+
+
+@st.cache_data
+def load_summary(start_date: datetime, end_date: datetime) -> dict:
+    """Load and cache the summary metrics for a date range."""
+    df = load_data(start_date, end_date)
+    durations = df["duration"].astype("float64")
+    return {
+        "total_records": len(df),
+        "total_duration": durations.sum(),
+        "avg_duration": durations.mean(),
+        # Empty tag lists explode to NaN, which nunique ignores
+        "unique_tags": df["tags"].explode().nunique(),
+    }
+
+
+@st.cache_data
+def build_sunburst_chart(
+    start_date: datetime, end_date: datetime, max_depth: int
+) -> Optional[go.Figure]:
+    """
+    Build and cache the sunburst chart for a date range and tag depth.
+
+    Returns:
+        Plotly figure, or None if there is nothing to display
+    """
+    # Group records by tags
+    df = load_data(start_date, end_date)
+    hierarchy = group_by_tags_hierarchy(df, max_depth)
+
+    # Create sunburst data
+    ids, labels, parents, values = create_sunburst_data(hierarchy, max_depth)
+    if not ids or not values:
+        return None
+
+    # Convert values to hours for better readability
+    values_hours = [v / 3600 for v in values]
+
+    # Create sunburst chart
+    fig_sunburst = go.Figure(
+        go.Sunburst(
+            ids=ids,
+            labels=labels,
+            parents=parents,
+            values=values_hours,
+            branchvalues="total",  # Values represent totals including all descendants
+            hovertemplate="<b>%{label}</b><br>Duration: %{value:.2f} hours<br>%{percentParent:.1%} of parent<extra></extra>",
+            maxdepth=max_depth,
+        )
+    )
+    fig_sunburst.update_layout(
+        title=f"Time Distribution by Tags (Depth: {max_depth})",
+        height=700,
+        margin=dict(t=50, l=0, r=0, b=0),
+    )
+    return fig_sunburst
+
+
+@st.cache_data
+def build_period_chart(
+    start_date: datetime, end_date: datetime, granularity: str
+) -> Tuple[Optional[go.Figure], Optional[pd.DataFrame]]:
+    """
+    Build and cache the stacked bar chart and its data table for a date range
+    and granularity.
+
+    Returns:
+        (figure, table) or (None, None) if there is nothing to display
+    """
+    # Group records by period and level 1 tags
+    df = load_data(start_date, end_date)
+    period_tag_df = group_by_period_and_tags(df, granularity)
+    if period_tag_df.empty:
+        return None, None
+
+    # Tags are the columns, periods the (sorted) index
+    all_tags = list(period_tag_df.columns)
+    # Convert period keys to display labels once
+    period_labels = format_period_keys(period_tag_df.index, granularity)
+    period_tag_hours = period_tag_df / 3600  # Convert to hours
+    period_tag_hours.index = period_labels
+
+    # Prepare data for stacked bar chart
+    # Each tag will be a separate trace
+    fig_bar = go.Figure()
+
+    # Create a trace for each tag
+    for tag in all_tags:
+        fig_bar.add_trace(
+            go.Bar(
+                name=tag,
+                x=period_labels,
+                y=period_tag_hours[tag].tolist(),
+                hovertemplate=f"<b>{tag}</b><br>Period: %{{x}}<br>Duration: %{{y:.2f}} hours<extra></extra>",
+            )
+        )
+
+    fig_bar.update_layout(
+        title=f"Time Distribution by {granularity.capitalize()} and Level 1 Tags",
+        xaxis_title="Time Period",
+        yaxis_title="Hours",
+        barmode="stack",  # Stacked bars
+        height=500,
+        xaxis={
+            "type": "category",  # Keep period order, labels are not parsed as dates
+            "tickangle": -45,
+        },
+        legend=dict(
+            orientation="v",
+            yanchor="top",
+            y=1,
+            xanchor="left",
+            x=1.02,
+        ),
+    )
+
+    # Periods as rows and tags as columns
+    table_df = period_tag_hours.rename_axis("Period").reset_index()
+    return fig_bar, table_df
 
 
 def main():
+    st.set_page_config(page_title="Timetagger Analytics", layout="wide")
+
     # Initialize session state
     if "authenticated" not in st.session_state:
         st.session_state["authenticated"] = False
 
     # Check authentication
     if not st.session_state["authenticated"]:
-        st.set_page_config(page_title="Timetagger Analytics - Login", layout="centered")
         show_login_page()
         return
 
-    st.set_page_config(page_title="Timetagger Analytics", layout="wide")
-
     # Logout button in sidebar
     with st.sidebar:
         st.write(f"Logged in as: **{st.session_state.get('username', 'User')}**")
@@ -497,23 +758,18 @@ def main():
 
     st.title("📊 Timetagger Analytics")
 
-    # Initialize database connection
+    # Get date range from all records
     try:
-        with TimetaggerDB() as db:
-            # Get date range from all records
-            all_records = db.get_parsed_records()
-            if not all_records:
-                st.error("No records found in database.")
-                return
-
-            min_date = min(
-                r["datetime_start"] for r in all_records if r["datetime_start"]
-            )
-            max_date = max(r["datetime_end"] for r in all_records if r["datetime_end"])
+        date_bounds = load_date_bounds()
     except Exception as e:
         st.error(f"Error connecting to database: {e}")
         return
 
+    if date_bounds is None:
+        st.error("No records found in database.")
+        return
+    min_date, max_date = date_bounds
+
     # Sidebar controls
     st.sidebar.header("Filters")
 
@@ -540,7 +796,8 @@ def main():
 
     # Convert to datetime
     start_datetime = datetime.combine(start_date, datetime.min.time())
-    end_datetime = datetime.combine(end_date, datetime.max.time())
+    # Exclusive upper bound: records ending exactly at midnight are still included
+    end_datetime = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
 
     # Load data
     df = load_data(start_datetime, end_datetime)
@@ -550,21 +807,18 @@ def main():
         return
 
     # Display summary stats
+    summary = load_summary(start_datetime, end_datetime)
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Records", len(df))
+        st.metric("Total Records", summary["total_records"])
     with col2:
-        total_duration = df["duration"].sum()
-        hours = total_duration / 3600
+        hours = summary["total_duration"] / 3600
         st.metric("Total Time", f"{hours:.1f} hours")
     with col3:
-        avg_duration = df["duration"].mean()
+        avg_duration = summary["avg_duration"]
         st.metric("Avg Duration", f"{avg_duration / 60:.1f} min")
     with col4:
-        unique_tags = set()
-        for tags in df["tags"]:
-            unique_tags.update(tags)
-        st.metric("Unique Tags", len(unique_tags))
+        st.metric("Unique Tags", summary["unique_tags"])
 
     st.divider()
 
@@ -573,44 +827,18 @@ def main():
 
     # Depth selector for sunburst chart
     max_tag_depth = st.slider(
-        "Tag Hierarchy Depth", min_value=1, max_value=5, value=2, key="sunburst_depth"
+        "Tag Hierarchy Depth",
+        min_value=1,
+        max_value=MAX_TAG_DEPTH,
+        value=2,
+        key="sunburst_depth",
     )
 
-    # Group records by tags
-    records_list = df.to_dict("records")
-    hierarchy = group_by_tags_hierarchy(records_list, max_tag_depth)
-
-    # Create sunburst chart
-    if hierarchy:
-        # Create sunburst data
-        ids, labels, parents, values = create_sunburst_data(hierarchy, max_tag_depth)
-
-        if ids and values:
-            # Convert values to hours for better readability
-            values_hours = [v / 3600 for v in values]
-
-            # Create sunburst chart
-            fig_sunburst = go.Figure(
-                go.Sunburst(
-                    ids=ids,
-                    labels=labels,
-                    parents=parents,
-                    values=values_hours,
-                    branchvalues="total",  # Values represent totals including all descendants
-                    hovertemplate="<b>%{label}</b><br>Duration: %{value:.2f} hours<br>%{percentParent:.1%} of parent<extra></extra>",
-                    maxdepth=max_tag_depth,
-                )
-            )
-            fig_sunburst.update_layout(
-                title=f"Time Distribution by Tags (Depth: {max_tag_depth})",
-                height=700,
-                margin=dict(t=50, l=0, r=0, b=0),
-            )
-            st.plotly_chart(fig_sunburst, width="stretch")
-        else:
-            st.info("No data to display for selected depth.")
+    fig_sunburst = build_sunburst_chart(start_datetime, end_datetime, max_tag_depth)
+    if fig_sunburst is not None:
+        st.plotly_chart(fig_sunburst, width="stretch")
     else:
-        st.info("No records with tags found.")
+        st.info("No data to display for selected depth.")
 
     st.divider()
 
@@ -619,93 +847,16 @@ def main():
 
     # Granularity selector for bar chart
     granularity = st.selectbox(
-        "Granularity", ["days", "weeks", "months"], index=1, key="bar_granularity"
+        "Granularity", GRANULARITIES, index=1, key="bar_granularity"
     )
 
-    # Group records by period and level 1 tags
-    period_tag_data = group_by_period_and_tags(records_list, granularity)
-
-    if period_tag_data:
-        # Get all unique tags across all periods
-        all_tags = set()
-        for period_data in period_tag_data.values():
-            all_tags.update(period_data.keys())
-        all_tags = sorted(all_tags)
-
-        # Get sorted period keys
-        sorted_periods = sorted(period_tag_data.keys())
-
-        # Prepare data for stacked bar chart
-        # Each tag will be a separate trace
-        fig_bar = go.Figure()
-
-        # Create a trace for each tag
-        for tag in all_tags:
-            values = []
-            for period in sorted_periods:
-                values.append(
-                    period_tag_data[period].get(tag, 0) / 3600
-                )  # Convert to hours
-
-            fig_bar.add_trace(
-                go.Bar(
-                    name=tag,
-                    x=sorted_periods,
-                    y=values,
-                    hovertemplate=f"<b>{tag}</b><br>Period: %{{x}}<br>Duration: %{{y:.2f}} hours<extra></extra>",
-                )
-            )
+    fig_bar, table_df = build_period_chart(start_datetime, end_datetime, granularity)
 
-        # Format period labels for display
-        if granularity == "days":
-            x_labels = [
-                datetime.strptime(p, "%Y-%m-%d").strftime("%b %d, %Y")
-                for p in sorted_periods
-            ]
-        elif granularity == "weeks":
-            x_labels = [
-                f"Week {p.split('-W')[1]}, {p.split('-W')[0]}" for p in sorted_periods
-            ]
-        elif granularity == "months":
-            x_labels = [
-                datetime.strptime(p, "%Y-%m").strftime("%B %Y") for p in sorted_periods
-            ]
-        else:
-            x_labels = sorted_periods
-
-        fig_bar.update_layout(
-            title=f"Time Distribution by {granularity.capitalize()} and Level 1 Tags",
-            xaxis_title="Time Period",
-            yaxis_title="Hours",
-            barmode="stack",  # Stacked bars
-            height=500,
-            xaxis={
-                "tickmode": "array",
-                "tickvals": sorted_periods,
-                "ticktext": x_labels,
-                "tickangle": -45,
-            },
-            legend=dict(
-                orientation="v",
-                yanchor="top",
-                y=1,
-                xanchor="left",
-                x=1.02,
-            ),
-        )
+    if fig_bar is not None:
         st.plotly_chart(fig_bar, width="stretch")
 
         # Display table
         with st.expander("View Data Table"):
-            # Create a table with periods as rows and tags as columns
-            table_data = []
-            for period in sorted_periods:
-                row = {"Period": period}
-                for tag in all_tags:
-                    row[tag] = period_tag_data[period].get(tag, 0) / 3600
-                table_data.append(row)
-
-            table_df = pd.DataFrame(table_data)
             st.dataframe(table_df, width="stretch")
     else:
         st.info("No data to display.")
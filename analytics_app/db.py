@@ -6,24 +6,294 @@ This script provides a connection interface to the Timetagger database
 located at data/timetagger/_timetagger/users/pe51k~cGU1MWs=.db
 """
 
-import json
+import queue
 import re
 import sqlite3
-from datetime import datetime
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import orjson
+import simdjson
+
+# simdjson parsers reuse their buffers but must not be shared between threads
+_simdjson_local = threading.local()
+
+
+def _record_fields(raw: str) -> Tuple[Any, Any]:
+    """
+    Read the key and description of a record's _ob JSON document.
+
+    Args:
+        raw: The _ob JSON text
+
+    Returns:
+        (key, description), empty strings when missing
+
+    Raises:
+        ValueError: If raw is not valid JSON
+    """
+    parser = getattr(_simdjson_local, "parser", None)
+    if parser is None:
+        parser = _simdjson_local.parser = simdjson.Parser()
+    # Lazy document: only the two fields are converted to Python objects.
+    # It must not outlive this call, the parser refuses to parse again while
+    # a document still references its buffer.
+    doc = parser.parse(raw)
+    return doc.get("key", ""), doc.get("ds", "")
+
+
+# Tags are words starting with # (Unicode word characters, like timetagger itself)
+_TAG_RE = re.compile(r"#(\w+)")
+
+# Read-side tuning applied to every connection: 64 MiB page cache, in-memory
+# temp tables and a 256 MiB memory map so hot pages skip read() syscalls
+_READ_PRAGMAS = (
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Opt-in only (see TimetaggerDB tune_file): the journal mode is persisted in the
+# database file, and a WAL database cannot be opened from a read-only directory
+_WRITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+_CACHED_STATEMENTS = 256
+
+
+@lru_cache(maxsize=65536)
+def _cached_tags(description: str) -> Tuple[str, ...]:
+    """Tags of a description, memoized (records repeat the same descriptions a lot)."""
+    # A substring check skips the regex engine for descriptions without tags;
+    # a hand-rolled split/isalnum scanner measured ~2x slower than findall
+    if "#" not in description:
+        return ()
+    return tuple(_TAG_RE.findall(description))
+
+
+def _extract_tags_batch(descriptions: Sequence[str]) -> List[List[str]]:
+    """
+    Extract the tags of many descriptions in one pass.
+
+    Args:
+        descriptions: Description strings containing tags
+
+    Returns:
+        One list of tags (in order of appearance, without #) per description
+    """
+    # Cache hits skip the regex; the tuple is copied so callers get their own list.
+    # A single finditer over the joined descriptions needs a Python step per match
+    # and measured slower than one findall per description.
+    return [list(_cached_tags(text)) if text else [] for text in descriptions]
+
+
+@lru_cache(maxsize=128)
+def _row_class(columns: Tuple[str, ...]) -> type:
+    """
+    Build (once per column list) the namedtuple class used for query results.
+
+    Args:
+        columns: Column names from cursor.description
+
+    Returns:
+        namedtuple subclass; names that are not valid fields (e.g. _ob) are
+        renamed positionally, as_dict() maps back to the original column names
+    """
+    base = namedtuple("Row", columns, rename=True)
+
+    class Row(base):
+        __slots__ = ()
+
+        def as_dict(self) -> Dict[str, Any]:
+            """Return the row as a dictionary keyed by column name."""
+            return dict(zip(columns, self))
+
+    return Row
+
+
+# Field order of the parsed record dictionaries
+_PARSED_FIELDS = (
+    "key",
+    "t1",
+    "t2",
+    "duration",
+    "description",
+    "tags",
+    "datetime_start",
+    "datetime_end",
+)
+
+
+# Naive epoch and units for the local time conversion
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+_MICROSECOND = timedelta(microseconds=1)
+_DAY = 86400
+
+
+def _durations(t1: np.ndarray, t2: np.ndarray) -> np.ndarray:
+    """Vectorized record durations: t2 - t1, or 0 when either end is missing or 0."""
+    valid = (t1 != 0) & (t2 != 0) & ~np.isnan(t1) & ~np.isnan(t2)
+    return np.where(valid, t2 - t1, 0.0)
+
+
+def _to_local_datetimes(timestamps: np.ndarray) -> np.ndarray:
+    """
+    Vectorized datetime.fromtimestamp: naive local time as datetime64[us].
+
+    Args:
+        timestamps: float64 Unix timestamps (NaN for NULL)
+
+    Returns:
+        datetime64[us] array, NaT where the timestamp is missing or 0
+    """
+    result = np.full(len(timestamps), np.datetime64("NaT"), dtype="datetime64[us]")
+    valid = ~np.isnan(timestamps) & (timestamps != 0)
+    seconds = timestamps[valid]
+    if not seconds.size:
+        return result
+
+    # The UTC offset only changes at DST transitions: look it up at both ends of
+    # each distinct (UTC) day instead of calling fromtimestamp for every record
+    days, inverse = np.unique((seconds // _DAY).astype(np.int64), return_inverse=True)
+    inverse = inverse.ravel()
+    day_starts = (days * _DAY).tolist()
+    first = np.array([_utc_offset(start) for start in day_starts])
+    last = np.array([_utc_offset(start + _DAY - 1) for start in day_starts])
+
+    local = np.rint((seconds + first[inverse]) * 1e6).astype(np.int64)
+    # Days containing a transition are converted record by record
+    mixed = (first != last)[inverse]
+    if mixed.any():
+        local[mixed] = [
+            (datetime.fromtimestamp(t) - _EPOCH) // _MICROSECOND
+            for t in seconds[mixed].tolist()
+        ]
+    result[valid] = local.view("datetime64[us]")
+    return result
+
+
+def _utc_offset(timestamp: int) -> int:
+    """Local UTC offset in seconds at a Unix timestamp."""
+    return (datetime.fromtimestamp(timestamp) - _EPOCH) // _SECOND - timestamp
+
+
+def _jsonable(values: np.ndarray) -> List[Optional[str]]:
+    """
+    Convert a datetime64 column to JSON-compatible Python values.
+
+    Args:
+        values: datetime64 array, possibly containing NaT
+
+    Returns:
+        List of ISO 8601 strings, None for NaT
+    """
+    return [
+        value.isoformat() if value is not None else None
+        for value in values.astype(object)
+    ]
+
+
+class _Pool:
+    """Reader connections shared between threads, opened lazily up to a fixed size."""
+
+    def __init__(self, factory: Callable[[], sqlite3.Connection], size: int):
+        """
+        Initialize an empty pool.
+
+        Args:
+            factory: Callable opening a new connection
+            size: Maximum number of connections
+        """
+        self._factory = factory
+        self._size = size
+        self._idle: queue.SimpleQueue = queue.SimpleQueue()
+        self._opened: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, opening one if the pool is not full yet."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._opened) < self._size:
+                conn = self._factory()
+                self._opened.append(conn)
+                return conn
+
+        # All connections are busy: wait for one to be released
+        return self._idle.get()
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection taken with acquire."""
+        self._idle.put(conn)
+
+    def close(self):
+        """Close every connection opened by the pool."""
+        with self._lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened.clear()
+            self._idle = queue.SimpleQueue()
 
 
 class TimetaggerDB:
     """Class to handle connections and queries to the Timetagger database."""
 
-    def __init__(self, db_path: Optional[str] = None):
+    # Fixed statement per (has_start, has_end) so SQLite can reuse the prepared plan.
+    # Only the indexed t1 column is bounded (half-open); t2 is checked in Python.
+    _PARSED_QUERIES = {
+        (False, False): "SELECT _ob, t1, t2 FROM records ORDER BY t1 DESC",
+        (True, False): "SELECT _ob, t1, t2 FROM records WHERE t1 >= ? ORDER BY t1 DESC",
+        (False, True): "SELECT _ob, t1, t2 FROM records WHERE t1 < ? ORDER BY t1 DESC",
+        (True, True): (
+            "SELECT _ob, t1, t2 FROM records WHERE t1 >= ? AND t1 < ? ORDER BY t1 DESC"
+        ),
+    }
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        read_only: bool = False,
+        pool_size: int = 4,
+        tune_file: bool = False,
+    ):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to the database file. If None, uses default path from environment or default location.
+            read_only: Open the database in SQLite read-only mode (execute_update will fail)
+            pool_size: Maximum number of reader connections used by concurrent queries
+            tune_file: Switch the database file to WAL mode and create the t1 index if
+                missing. These changes are persisted in the file; leave this off for a
+                database owned by a running timetagger server (ignored when read_only)
         """
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be at least 1, got {pool_size}")
+
         if db_path is None:
             import os
 
@@ -45,13 +315,27 @@ class TimetaggerDB:
         if not self.db_path.exists():
             raise FileNotFoundError(f"Database file not found: {self.db_path}")
 
+        self.read_only = read_only
+        self.pool_size = pool_size
+        self.tune_file = tune_file and not read_only
+        # Single writer connection (also used for opt-in index maintenance) ...
         self.conn: Optional[sqlite3.Connection] = None
+        # ... and a pool of reader connections for SELECT queries
+        self._readers: Optional[_Pool] = None
+        # Metadata query results, cleared on every write (see execute_update)
+        self._meta_cache: Dict[Tuple, Any] = {}
 
-    @staticmethod
-    def _find_database_file() -> Optional[Path]:
+    # Database path found by _find_database_file (reused for the process lifetime)
+    _found_database_file: Optional[Path] = None
+
+    @classmethod
+    def _find_database_file(cls) -> Optional[Path]:
         """Try to find the database file in common locations."""
         import os
 
+        if cls._found_database_file is not None:
+            return cls._found_database_file
+
         # Possible base paths to search
         search_paths = []
 
@@ -77,60 +361,172 @@ class TimetaggerDB:
         # Search for database files in users directory
         db_filename = "pe51k~cGU1MWs=.db"
 
-        # Try direct paths and recursive search
+        # Try the expected structure and the base directory itself (a few stat calls)
+        found = None
         for base in search_paths:
-            # Search recursively for the database file
-            if base.exists():
-                for db_file in base.rglob(db_filename):
-                    if db_file.is_file():
-                        return db_file
-
-                # Try the expected structure
-                expected_path = base / "_timetagger" / "users" / db_filename
-                if expected_path.exists():
-                    return expected_path
+            for candidate in (
+                base / "_timetagger" / "users" / db_filename,
+                base / db_filename,
+            ):
+                if os.path.isfile(candidate):
+                    found = candidate
+                    break
+            if found:
+                break
+
+        # Recursive search walks the whole volume, so it has to be enabled explicitly
+        if found is None and os.getenv("TIMETAGGER_ALLOW_RGLOB") == "1":
+            for base in search_paths:
+                if base.exists():
+                    found = next(
+                        (f for f in base.rglob(db_filename) if f.is_file()), None
+                    )
+                    if found:
+                        break
 
         # If not found, try any .db file in users directory
-        for base in search_paths:
-            users_dir = base / "_timetagger" / "users"
-            if users_dir.exists():
-                db_files = list(users_dir.glob("*.db"))
-                if db_files:
-                    # Return the first one found
-                    return db_files[0]
-
-        return None
+        if found is None:
+            for base in search_paths:
+                users_dir = base / "_timetagger" / "users"
+                if users_dir.exists():
+                    db_files = list(users_dir.glob("*.db"))
+                    if db_files:
+                        # Use the first one found
+                        found = db_files[0]
+                        break
+
+        # Only a hit is cached: the database may be created after a failed lookup
+        cls._found_database_file = found
+        return found
 
     def connect(self):
         """Establish connection to the database."""
-        self.conn = sqlite3.connect(str(self.db_path))
-        self.conn.row_factory = sqlite3.Row  # Enable column access by name
+        self.conn = self._open_connection(writer=self.tune_file)
+        self._readers = _Pool(self._open_connection, self.pool_size)
+
+        if self.tune_file:
+            self._ensure_indexes()
         return self.conn
 
+    def _open_connection(self, writer: bool = False) -> sqlite3.Connection:
+        """
+        Open a new connection with the tuned PRAGMAs applied.
+
+        Args:
+            writer: Also apply the persistent write PRAGMAs (only with tune_file)
+
+        Returns:
+            The new connection
+        """
+        # Connections may be shared between threads (e.g. Streamlit sessions)
+        if self.read_only:
+            conn = sqlite3.connect(
+                self.db_path.resolve().as_uri() + "?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=_CACHED_STATEMENTS,
+            )
+            pragmas = _READ_PRAGMAS
+        else:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=_CACHED_STATEMENTS,
+            )
+            pragmas = _WRITE_PRAGMAS + _READ_PRAGMAS if writer else _READ_PRAGMAS
+
+        for pragma in pragmas:
+            conn.execute(pragma)
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        return conn
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a reader connection from the pool for the duration of a query."""
+        if not self.conn:
+            self.connect()
+
+        readers = self._readers
+        conn = readers.acquire()
+        try:
+            yield conn
+        finally:
+            readers.release(conn)
+
+    def _ensure_indexes(self):
+        """Create the t1 index if the record queries would otherwise scan and sort."""
+        try:
+            plan = self.conn.execute(
+                "EXPLAIN QUERY PLAN " + self._PARSED_QUERIES[(True, True)], (0, 0)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # No records table (not a timetagger database)
+            return
+
+        # Timetagger itself creates idx_records_t1, so this is normally a no-op
+        details = [row[-1] for row in plan]
+        if any(
+            "TEMP B-TREE" in detail
+            or (detail.startswith("SCAN records") and "INDEX" not in detail)
+            for detail in details
+        ):
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_records_t1 ON records (t1 DESC)"
+            )
+
     def disconnect(self):
-        """Close the database connection."""
+        """Close the database connections."""
+        if self._readers:
+            self._readers.close()
+            self._readers = None
         if self.conn:
             self.conn.close()
             self.conn = None
 
-    def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    def execute_query(self, query: str, params: tuple = ()) -> List[NamedTuple]:
         """
-        Execute a SELECT query and return results as list of dictionaries.
+        Execute a SELECT query and return results as list of named tuples.
 
         Args:
             query: SQL query string
             params: Query parameters for prepared statements
 
         Returns:
-            List of dictionaries representing rows
+            List of named tuples representing rows (fields named after the columns,
+            use row.as_dict() for a dictionary)
         """
-        if not self.conn:
-            self.connect()
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # Plain tuples, wrapped below
+            cursor.execute(query, params)
+            row_cls = _row_class(tuple(column[0] for column in cursor.description))
+            return list(map(row_cls._make, cursor.fetchall()))
+
+    def _iter_query(
+        self, query: str, params: tuple = (), arraysize: int = 10000
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Execute a SELECT query and stream its rows in batches.
 
-        cursor = self.conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+        Args:
+            query: SQL query string
+            params: Query parameters for prepared statements
+            arraysize: Number of rows fetched per batch
+
+        Yields:
+            sqlite3.Row objects (indexable by position and by column name)
+        """
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = arraysize
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                yield from rows
 
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """
@@ -149,54 +545,120 @@ class TimetaggerDB:
         cursor = self.conn.cursor()
         cursor.execute(query, params)
         self.conn.commit()
+        self._meta_cache.clear()
         return cursor.rowcount
 
     def get_tables(self) -> List[str]:
         """Get list of all tables in the database."""
-        query = "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-        result = self.execute_query(query)
-        return [row["name"] for row in result]
+        key = ("tables",)
+        if key not in self._meta_cache:
+            query = "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+            result = self.execute_query(query)
+            self._meta_cache[key] = [row.name for row in result]
+        return list(self._meta_cache[key])
 
     def get_table_schema(self, table_name: str) -> str:
         """Get the CREATE TABLE statement for a given table."""
-        if not self.conn:
-            self.connect()
+        key = ("schema", table_name)
+        if key in self._meta_cache:
+            return self._meta_cache[key]
 
-        cursor = self.conn.cursor()
-        cursor.execute(
+        result = self.execute_query(
             "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,)
         )
-        result = cursor.fetchone()
-        return result[0] if result else ""
+        self._meta_cache[key] = result[0].sql if result else ""
+        return self._meta_cache[key]
+
+    def _get_table_columns(self, table_name: str) -> List[str]:
+        """Get the column names of a table (used to whitelist projections)."""
+        key = ("columns", table_name)
+        if key not in self._meta_cache:
+            result = self.execute_query(
+                "SELECT name FROM pragma_table_info(?)", (table_name,)
+            )
+            self._meta_cache[key] = [row.name for row in result]
+        return self._meta_cache[key]
+
+    def get_records_count(self, cached: bool = False) -> int:
+        """
+        Get total number of records.
+
+        Args:
+            cached: Reuse the count from an earlier cached call. Writes made by
+                other processes (e.g. the timetagger server) are not seen.
+
+        Returns:
+            Number of rows in the records table
+        """
+        key = ("records_count",)
+        if cached and key in self._meta_cache:
+            return self._meta_cache[key]
 
-    def get_records_count(self) -> int:
-        """Get total number of records."""
         query = "SELECT COUNT(*) as count FROM records"
         result = self.execute_query(query)
-        return result[0]["count"] if result else 0
+        count = result[0].count if result else 0
+        if cached:
+            self._meta_cache[key] = count
+        return count
+
+    def get_date_bounds(self) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Get the date range covered by all records.
 
-    def get_userinfo(self) -> List[Dict[str, Any]]:
+        Returns:
+            (earliest start, latest end) as datetime objects, or None if there are no records
+        """
+        # Separate subqueries so each aggregate can be answered from the t1/t2 index
+        query = (
+            "SELECT (SELECT MIN(t1) FROM records WHERE t1 > 0) AS t1_min, "
+            "(SELECT MAX(t2) FROM records WHERE t2 > 0) AS t2_max"
+        )
+        result = self.execute_query(query)
+        if not result or result[0].t1_min is None or result[0].t2_max is None:
+            return None
+        return (
+            datetime.fromtimestamp(result[0].t1_min),
+            datetime.fromtimestamp(result[0].t2_max),
+        )
+
+    def get_userinfo(self) -> List[NamedTuple]:
         """Get all userinfo entries."""
         return self.execute_query("SELECT * FROM userinfo")
 
-    def get_settings(self) -> List[Dict[str, Any]]:
+    def get_settings(self) -> List[NamedTuple]:
         """Get all settings entries."""
         return self.execute_query("SELECT * FROM settings")
 
-    def get_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_records(
+        self,
+        limit: Optional[int] = None,
+        columns: Optional[Sequence[str]] = ("key", "t1", "t2"),
+    ) -> List[NamedTuple]:
         """
         Get records from the database.
 
         Args:
             limit: Maximum number of records to return (None for all)
+            columns: Columns to select (None for all, including the _ob JSON)
 
         Returns:
-            List of record dictionaries
+            List of record rows (named tuples)
+
+        Raises:
+            ValueError: If a column does not exist in the records table
         """
-        query = "SELECT * FROM records ORDER BY t1 DESC"
-        if limit:
-            query += " LIMIT {}".format(limit)
-        return self.execute_query(query)
+        if columns is None:
+            projection = "*"
+        else:
+            known = self._get_table_columns("records")
+            unknown = [column for column in columns if column not in known]
+            if unknown or not columns:
+                raise ValueError(f"Invalid records columns: {list(columns)}")
+            projection = ", ".join(f'"{column}"' for column in columns)
+
+        # Bound parameter keeps one statement text; SQLite treats LIMIT -1 as no limit
+        query = f"SELECT {projection} FROM records ORDER BY t1 DESC LIMIT ?"
+        return self.execute_query(query, (limit if limit else -1,))
 
     def get_parsed_records(
         self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
@@ -206,59 +668,167 @@ class TimetaggerDB:
 
         Args:
             start_date: Filter records starting from this date (inclusive)
-            end_date: Filter records ending before this date (inclusive)
+            end_date: Filter records ending at or before this date (records must start before it)
 
         Returns:
             List of parsed record dictionaries with:
             - key: record key
             - t1: start timestamp
             - t2: end timestamp
-            - duration: duration in seconds
+            - duration: t2 - t1 in seconds, 0 when either end is missing
             - description: description text
             - tags: list of tags (ordered by appearance)
             - datetime_start: datetime object for t1
             - datetime_end: datetime object for t2
         """
-        query = "SELECT _ob, t1, t2 FROM records WHERE 1=1"
-        params = []
+        keys, t1s, t2s, descriptions, tags = self._fetch_parsed_rows(
+            start_date, end_date
+        )
+        t1 = np.array(t1s, dtype=np.float64)
+        t2 = np.array(t2s, dtype=np.float64)
+
+        # Durations keep the stored value types (int stays int, 0 when an end is
+        # missing), unlike the float64 get_parsed_columns column
+        durations = [b - a if b and a else 0 for a, b in zip(t1s, t2s)]
+
+        # datetime64[us].astype(object) yields datetime objects (None for NaT)
+        rows = zip(
+            keys,
+            t1s,
+            t2s,
+            durations,
+            descriptions,
+            tags,
+            _to_local_datetimes(t1).astype(object),
+            _to_local_datetimes(t2).astype(object),
+        )
+        return [dict(zip(_PARSED_FIELDS, row)) for row in rows]
+
+    def get_parsed_columns(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        with_datetimes: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Get parsed records column by column (one sequence per field).
 
-        if start_date:
-            query += " AND t1 >= ?"
-            params.append(int(start_date.timestamp()))
+        Same fields and filters as get_parsed_records, without building a dict per
+        record. The result can be passed straight to pandas.DataFrame.
 
-        if end_date:
-            query += " AND t2 <= ?"
-            params.append(int(end_date.timestamp()))
+        Args:
+            start_date: Filter records starting from this date (inclusive)
+            end_date: Filter records ending at or before this date (records must start before it)
+            with_datetimes: Also build the datetime_start/datetime_end columns
 
-        query += " ORDER BY t1 DESC"
+        Returns:
+            Dictionary with list columns key, description, tags, float64 array
+            columns t1, t2 (NaN for NULL) and duration, and datetime64[us] array
+            columns datetime_start, datetime_end (naive local time, NaT if missing)
+        """
+        keys, t1s, t2s, descriptions, tags = self._fetch_parsed_rows(
+            start_date, end_date
+        )
+        t1 = np.array(t1s, dtype=np.float64)
+        t2 = np.array(t2s, dtype=np.float64)
+
+        columns = {
+            "key": keys,
+            "t1": t1,
+            "t2": t2,
+            "duration": _durations(t1, t2),
+            "description": descriptions,
+            "tags": tags,
+        }
+        if with_datetimes:
+            columns["datetime_start"] = _to_local_datetimes(t1)
+            columns["datetime_end"] = _to_local_datetimes(t2)
+        return columns
+
+    def get_parsed_records_json(
+        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> bytes:
+        """
+        Get parsed records serialized as JSON, ready to be sent as a response body.
 
-        raw_records = self.execute_query(query, tuple(params))
-        parsed_records = []
+        Args:
+            start_date: Filter records starting from this date (inclusive)
+            end_date: Filter records ending at or before this date (records must start before it)
 
-        for record in raw_records:
+        Returns:
+            UTF-8 encoded JSON object with one array per get_parsed_records field;
+            datetimes are ISO 8601 strings in naive local time, missing values null
+        """
+        columns = self.get_parsed_columns(start_date, end_date)
+
+        # orjson cannot serialize NaT; those (rare) columns go through Python
+        for name in ("datetime_start", "datetime_end"):
+            if np.isnat(columns[name]).any():
+                columns[name] = _jsonable(columns[name])
+        # NumPy arrays are serialized directly, without Python objects per value
+        return orjson.dumps(columns, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def _fetch_parsed_rows(
+        self, start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> Tuple[List[str], List, List, List[str], List[List[str]]]:
+        """
+        Query and parse records into column lists.
+
+        Args:
+            start_date: Filter records starting from this date (inclusive)
+            end_date: Filter records ending at or before this date (records must start before it)
+
+        Returns:
+            (keys, t1 values, t2 values, descriptions, tag lists), malformed records skipped
+        """
+        start_ts = int(start_date.timestamp()) if start_date is not None else None
+        end_ts = int(end_date.timestamp()) if end_date is not None else None
+        flags = (start_ts is not None, end_ts is not None)
+        params = tuple(ts for ts in (start_ts, end_ts) if ts is not None)
+
+        keys, t1s, t2s, descriptions = self._fetch_fields(
+            self._PARSED_QUERIES[flags], params, end_ts
+        )
+        return keys, t1s, t2s, descriptions, _extract_tags_batch(descriptions)
+
+    def _fetch_fields(
+        self, query: str, params: tuple, end_ts: Optional[int]
+    ) -> Tuple[List[str], List, List, List[str]]:
+        """
+        Run a _PARSED_QUERIES statement and parse each _ob document in Python.
+
+        Args:
+            query: Statement selecting _ob, t1, t2
+            params: Query parameters
+            end_ts: Upper bound for t2 (inclusive), None for no bound
+
+        Returns:
+            (keys, t1 values, t2 values, descriptions), malformed records skipped
+        """
+        keys, t1s, t2s, descriptions = [], [], [], []
+        record_fields = _record_fields
+
+        # _ob stays str: fetching it as bytes (text_factory=bytes or CAST AS BLOB)
+        # measured within noise with simdjson, and a
+        # connection-wide text_factory would turn every other text column into bytes
+        # Columns by position: 0 = _ob, 1 = t1, 2 = t2
+        for row in self._iter_query(query, params):
+            t2 = row[2]
+            if end_ts is not None and (t2 is None or t2 > end_ts):
+                continue
             try:
-                _ob = json.loads(record["_ob"])
-                t1 = record["t1"]
-                t2 = record["t2"]
-                description = _ob.get("ds", "")
-                tags = self._extract_tags(description)
-
-                parsed_record = {
-                    "key": _ob.get("key", ""),
-                    "t1": t1,
-                    "t2": t2,
-                    "duration": t2 - t1 if t2 and t1 else 0,
-                    "description": description,
-                    "tags": tags,
-                    "datetime_start": datetime.fromtimestamp(t1) if t1 else None,
-                    "datetime_end": datetime.fromtimestamp(t2) if t2 else None,
-                }
-                parsed_records.append(parsed_record)
-            except (json.JSONDecodeError, KeyError, ValueError):
+                key, description = record_fields(row[0])
+            # simdjson decode errors are ValueErrors
+            except (KeyError, ValueError):
                 # Skip malformed records
                 continue
 
-        return parsed_records
+            keys.append(key)
+            t1s.append(row[1])
+            t2s.append(t2)
+            descriptions.append(description)
+
+        return keys, t1s, t2s, descriptions
 
     @staticmethod
     def _extract_tags(description: str) -> List[str]:
@@ -272,13 +842,7 @@ class TimetaggerDB:
         Returns:
             List of tags in order of appearance (without #)
         """
-        if not description:
-            return []
-
-        # Find all tags (words starting with #)
-        tag_pattern = r"#(\w+)"
-        tags = re.findall(tag_pattern, description)
-        return tags
+        return list(_cached_tags(description)) if description else []
 
     def __enter__(self):
         """Context manager entry."""
@@ -295,7 +859,8 @@ def main():
     # Example 1: Using context manager (recommended)
     print("=== Timetagger Database Connection Example ===\n")
 
-    with TimetaggerDB() as db:
+    # Only reads: never modify the database owned by the timetagger server
+    with TimetaggerDB(read_only=True) as db:
         # Get all tables
         print("Tables in database:")
         tables = db.get_tables()
@@ -312,10 +877,10 @@ def main():
 
         # Get recent records (limit 5)
         print("Recent records (last 5):")
-        records = db.get_records(limit=5)
+        records = db.get_records(limit=5, columns=("key", "t1", "t2"))
         for record in records:
-            print(f"  Key: {record.get('key', 'N/A')}")
-            print(f"    t1: {record.get('t1', 'N/A')}, t2: {record.get('t2', 'N/A')}")
+            print(f"  Key: {record.key}")
+            print(f"    t1: {record.t1}, t2: {record.t2}")
             print()
 
         print("=" * 50 + "\n")
@@ -324,8 +889,8 @@ def main():
         print("User info:")
         userinfo = db.get_userinfo()
         for info in userinfo:
-            print(f"  Key: {info.get('key', 'N/A')}")
-            print(f"    st: {info.get('st', 'N/A')}")
+            print(f"  Key: {info.key}")
+            print(f"    st: {info.st}")
             print()
 
         print("=" * 50 + "\n")
@@ -334,8 +899,8 @@ def main():
         print("Settings:")
         settings = db.get_settings()
         for setting in settings:
-            print(f"  Key: {setting.get('key', 'N/A')}")
-            print(f"    st: {setting.get('st', 'N/A')}")
+            print(f"  Key: {setting.key}")
+            print(f"    st: {setting.st}")
             print()
 
 